@@ -1,7 +1,10 @@
+from typing import Iterable, List, Tuple
+
 import logging
 
+import orjson
 from bentoml.adapters import JsonInput
-from bentoml.types import HTTPRequest, InferenceTask
+from bentoml.types import HTTPRequest, InferenceTask, JsonSerializable
 
 logger = logging.getLogger(__name__)
 
@@ -14,3 +17,16 @@ class SeldonJsonInput(JsonInput):
             logger.debug("Setting the task_id from the puid header: %s", puid)
             inference_task.task_id = puid
         return inference_task
+
+    def extract_user_func_args(
+        self, tasks: Iterable[InferenceTask[str]]
+    ) -> Tuple[List[JsonSerializable]]:
+        # Same contract as JsonInput.extract_user_func_args, but parsing with
+        # orjson instead of the stdlib json module.
+        json_inputs = []
+        for task in tasks:
+            try:
+                json_inputs.append(orjson.loads(task.data))
+            except (orjson.JSONDecodeError, UnicodeDecodeError, TypeError):
+                task.discard(http_status=400, err_msg="Not a valid JSON format")
+        return (json_inputs,)
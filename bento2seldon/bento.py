@@ -13,8 +13,10 @@ from typing import (
 
 import abc
 import datetime
+import functools
 import logging
 
+import orjson
 from bentoml import BentoService, api
 from bentoml.types import InferenceTask
 from decorator import decorate
@@ -28,6 +30,7 @@ from bento2seldon.logging import LoggingContext
 from bento2seldon.model import Settings
 from bento2seldon.monitoring import Monitor
 from bento2seldon.seldon import (
+    FAILURE,
     PRED_UNIT_ID,
     DefaultData,
     Feedback,
@@ -36,7 +39,6 @@ from bento2seldon.seldon import (
     SeldonMessage,
     SeldonMessageRequest,
     Status,
-    StatusFlag,
     Tensor,
 )
 
@@ -57,6 +59,19 @@ I = TypeVar(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _default_version() -> str:
+    return datetime.datetime.utcnow().strftime("%Y%m%d%H%M%I")
+
+
+def _format_error(code: int, info: str) -> str:
+    # The error payload has a fixed shape, so it is serialized directly
+    # instead of going through a SeldonMessage.
+    return orjson.dumps(
+        {"status": {"code": code, "info": info, "status": FAILURE}}
+    ).decode()
+
+
 class ExceptionHandler:
     def __init__(
         self,
@@ -74,13 +89,9 @@ class ExceptionHandler:
             logger.exception(
                 "Unexpected error", extra=self._logging_context.with_status(500)
             )
-            error = SeldonMessage[Any](
-                status=Status(
-                    code=500, info=str(value), status=StatusFlag.FAILURE.value
-                )
-            )
+            error = _format_error(500, str(value))
             for task in self._tasks:
-                task.discard(http_status=500, data=error.json(exclude_none=True))
+                task.discard(http_status=500, data=error)
 
     def __call__(self, f):
         def wrapped(func, *args, **kwargs):
@@ -103,12 +114,14 @@ class ExtraMonitoringHandler:
                 label: getattr(request.jsonData, label)
                 for label in self.extra_monitoring_request_fields
             }
-        return {}
+        # Always expose every field so the label arity stays consistent with
+        # the metric schema.
+        return {label: None for label in self.extra_monitoring_request_fields}
 
 
 class BaseBentoService(BentoService, metaclass=abc.ABCMeta):
     def versioneer(self):
-        return datetime.datetime.utcnow().strftime("%Y%m%d%H%M%I")
+        return _default_version()
 
     def get_logger_context(
         self, endpoint: str = "predict", batch_size: Optional[int] = None
@@ -118,17 +131,16 @@ class BaseBentoService(BentoService, metaclass=abc.ABCMeta):
             context = context.with_batch_size(batch_size)
         return context
 
-    @property
+    @functools.cached_property
     def settings(self) -> Settings:
-        if not hasattr(self, "_settings"):
-            self._settings = Settings()
-        return self._settings
+        return Settings()
 
-    @property
+    @functools.cached_property
     def monitor(self) -> Monitor:
-        if not hasattr(self, "_monitor"):
-            self._monitor = Monitor(self)
-        return self._monitor
+        return Monitor(
+            self,
+            extra_labelnames=getattr(self, "extra_monitoring_request_fields", ()),
+        )
 
     def _parse_input(
         self,
@@ -153,10 +165,7 @@ class BaseBentoService(BentoService, metaclass=abc.ABCMeta):
                 raw_request,
                 extra=logging_context.with_status(400),
             )
-            error = SeldonMessage[Any](
-                status=Status(code=400, info=str(e), status=StatusFlag.FAILURE.value)
-            )
-            task.discard(http_status=400, data=error.json(exclude_none=True))
+            task.discard(http_status=400, data=_format_error(400, str(e)))
             return None
 
     def _parse_inputs(
@@ -166,13 +175,26 @@ class BaseBentoService(BentoService, metaclass=abc.ABCMeta):
         request_type: Type[I],
         logging_context: LoggingContext,
     ) -> List[I]:
-        requests = []
-        for raw_request, task in zip(raw_requests, tasks):
-            request = self._parse_input(
-                raw_request, task, request_type, logging_context
-            )
-            if request is not None:
-                requests.append(request)
+        try:
+            # Validating the whole batch in a single parse_obj_as call keeps
+            # the per-item work inside pydantic instead of one Python frame
+            # per request.
+            requests = parse_obj_as(List[request_type], raw_requests)  # type: ignore[valid-type]
+        except ValidationError:
+            # At least one item is invalid: reparse one by one so that only
+            # the offending tasks are discarded.
+            requests = []
+            for raw_request, task in zip(raw_requests, tasks):
+                request = self._parse_input(
+                    raw_request, task, request_type, logging_context
+                )
+                if request is not None:
+                    requests.append(request)
+            return requests
+
+        for request, task in zip(requests, tasks):
+            if isinstance(request, SeldonMessage):
+                request.meta.puid = task.task_id
         return requests
 
 
@@ -184,27 +206,25 @@ class BaseBentoServiceWithResponse(
     def response_type(self) -> Type[RE]:
         pass
 
+    @functools.cached_property
+    def _seldon_message_response_cls(self) -> Type[SeldonMessage[RE]]:
+        return SeldonMessage[self.response_type]  # type: ignore[name-defined]
+
     def _format_response(
         self, response: Optional[RE], meta: Optional[Meta]
     ) -> Dict[str, Any]:
-        if meta:
-            seldon_message_response = SeldonMessage[self.response_type](  # type: ignore[name-defined]
-                status=Status(),
-                meta=meta,
-                jsonData=response,
-            )
-        else:
-            seldon_message_response = SeldonMessage[self.response_type](  # type: ignore[name-defined]
-                status=Status(),
-                jsonData=response,
-            )
-        return seldon_message_response.dict(exclude_none=True)
+        # Everything here was produced by the service itself, so the
+        # validation-free constructor is safe.
+        return self._seldon_message_response_cls.make(
+            jsonData=response, meta=meta
+        ).dict(exclude_none=True)
 
     def _format_responses(
         self, responses: List[RE], metas: List[Meta]
     ) -> List[Dict[str, Any]]:
+        format_response = self._format_response
         return [
-            self._format_response(response, meta)
+            format_response(response, meta)
             for response, meta in zip(responses, metas)
         ]
 
@@ -220,17 +240,26 @@ class BasePredictor(
     def request_type(self) -> Type[RT]:
         pass
 
-    @property
+    @functools.cached_property
+    def _seldon_message_request_cls(self) -> Type[SeldonMessageRequest[RT]]:
+        return SeldonMessageRequest[self.request_type]  # type: ignore[name-defined]
+
+    @functools.cached_property
+    def _feedback_cls(self) -> Type[Feedback[RT, RE]]:
+        return Feedback[
+            self.request_type, self.response_type  # type: ignore[name-defined]
+        ]
+
+    @functools.cached_property
     def cache(self) -> Cache[RT, RE]:
-        if not hasattr(self, "_cache"):
-            self._cache = Cache[RT, RE](
-                self,
-                self.request_type,
-                self.response_type,
-                self.settings.redis_url,
-                datetime.timedelta(seconds=self.settings.cache_duration),
-            )
-        return self._cache
+        return Cache[RT, RE](
+            self,
+            self.request_type,
+            self.response_type,
+            self.settings.redis_url,
+            datetime.timedelta(seconds=self.settings.cache_duration),
+            trusted=self.settings.trusted_cache,
+        )
 
     def _send_feedback(
         self,
@@ -241,7 +270,7 @@ class BasePredictor(
         routing: Optional[int],
     ) -> None:
         if reward is not None:
-            self._monitor.observe_reward(
+            self.monitor.observe_reward(
                 reward, extra=self.extract_fields_from_request(request)
             )
 
@@ -261,7 +290,7 @@ class BasePredictor(
             feedback = self._parse_input(
                 raw_feedback,
                 task,
-                Feedback[self.request_type, self.response_type],  # type: ignore[name-defined]
+                self._feedback_cls,
                 logging_context,
             )
 
@@ -293,11 +322,12 @@ class BasePredictor(
                             extra=logging_context,
                         )
 
-                routing = (
-                    feedback.response.meta.routing.get(PRED_UNIT_ID)
-                    if feedback.response and feedback.response.meta
-                    else None
-                )
+                try:
+                    routing = feedback.response.meta.routing.get(  # type: ignore[union-attr]
+                        PRED_UNIT_ID
+                    )
+                except AttributeError:
+                    routing = None
 
                 self._send_feedback(
                     feedback.request,
@@ -312,6 +342,14 @@ class BasePredictor(
 
 
 class BaseBatchPredictor(BasePredictor[RT, RE], Generic[RT, RE], metaclass=abc.ABCMeta):
+    # Override to return the relative processing cost of a request (e.g. its
+    # input length). When provided, uncached requests are sorted by it before
+    # being handed to _predict, so similarly sized inputs end up next to each
+    # other and padding waste is reduced. The responses are returned in the
+    # original order either way.
+    def _cost_key(self, request: RT) -> Optional[int]:
+        return None
+
     def _process_with_cache(
         self,
         seldon_message_requests: List[SeldonMessageRequest[RT]],
@@ -328,28 +366,40 @@ class BaseBatchPredictor(BasePredictor[RT, RE], Generic[RT, RE], metaclass=abc.A
             ],
             requests,
         )
-        uncached_requests: List[RT] = [
-            request
-            for request, response in zip(requests, responses)
-            if response is None
-        ]
-        uncached_metas = [
-            seldon_message_request.meta
-            for seldon_message_request, response in zip(
-                seldon_message_requests, responses
-            )
-            if response is None
-        ]
+        # A single pass collects the misses and where to merge their
+        # predictions back.
+        uncached_requests: List[RT] = []
+        uncached_metas: List[Meta] = []
+        miss_indices: List[int] = []
+        for i, (seldon_message_request, response) in enumerate(
+            zip(seldon_message_requests, responses)
+        ):
+            if response is None:
+                uncached_requests.append(seldon_message_request.jsonData)
+                uncached_metas.append(seldon_message_request.meta)
+                miss_indices.append(i)
 
         if uncached_requests:
-            uncached_responses = process_fn(uncached_requests)
+            cost_keys = [self._cost_key(request) for request in uncached_requests]
+            if cost_keys[0] is not None:
+                # Stable sort by cost, predict, then undo the permutation.
+                order = sorted(
+                    range(len(uncached_requests)), key=cost_keys.__getitem__
+                )
+                sorted_responses = process_fn(
+                    [uncached_requests[i] for i in order]
+                )
+                uncached_responses = cast(List[RE], [None] * len(order))
+                for position, i in enumerate(order):
+                    uncached_responses[i] = sorted_responses[position]
+            else:
+                uncached_responses = process_fn(uncached_requests)
             self.cache.set_responses(
                 uncached_requests, uncached_responses, uncached_metas
             )
 
-            for i, response in enumerate(responses):
-                if response is None:
-                    responses[i] = uncached_responses.pop(0)
+            for i, uncached_response in zip(miss_indices, uncached_responses):
+                responses[i] = uncached_response
 
         processed_responses = cast(
             List[RE], responses
@@ -382,11 +432,13 @@ class BaseBatchPredictor(BasePredictor[RT, RE], Generic[RT, RE], metaclass=abc.A
             seldon_message_requests = self._parse_inputs(
                 raw_requests,
                 tasks,
-                SeldonMessageRequest[self.request_type],  # type: ignore[name-defined]
+                self._seldon_message_request_cls,
                 logging_context,
             )
 
-            responses = self._process_with_cache(seldon_message_requests, self._predict)
+            responses = self._process_with_cache(
+                seldon_message_requests, self._predict
+            )
 
             return self._format_responses(
                 responses,
@@ -419,7 +471,7 @@ class BaseSinglePredictor(
             seldon_message_request = self._parse_input(
                 raw_request,
                 task,
-                SeldonMessageRequest[self.request_type],  # type: ignore[name-defined]
+                self._seldon_message_request_cls,
                 logging_context,
             )
 
@@ -455,6 +507,14 @@ class BaseCombiner(
     ) -> SeldonMessage[RE]:
         pass
 
+    @functools.cached_property
+    def _seldon_message_request_list_cls(
+        self,
+    ) -> Type[List[SeldonMessageRequest[RE]]]:
+        return List[
+            SeldonMessageRequest[self.response_type]  # type: ignore[name-defined]
+        ]
+
     def _merge_meta(self, metas: List[Meta]) -> Meta:
         tags = {}
         for meta in metas:
@@ -479,7 +539,7 @@ class BaseCombiner(
             seldon_message_list = self._parse_input(
                 raw_seldon_message_list,
                 task,
-                List[SeldonMessageRequest[self.response_type]],  # type: ignore[name-defined]
+                self._seldon_message_request_list_cls,
                 logging_context,
             )
 
@@ -502,17 +562,20 @@ class BaseRouter(BaseBentoService, Generic[RT], metaclass=abc.ABCMeta):
     def request_type(self) -> Type[RT]:
         pass
 
-    @property
+    @functools.cached_property
+    def _seldon_message_request_cls(self) -> Type[SeldonMessageRequest[RT]]:
+        return SeldonMessageRequest[self.request_type]  # type: ignore[name-defined]
+
+    @functools.cached_property
     def cache(self) -> Cache[RT, int]:
-        if not hasattr(self, "_cache"):
-            self._cache = Cache[RT, int](
-                self,
-                self.request_type,
-                int,
-                self.settings.redis_url,
-                datetime.timedelta(seconds=self.settings.cache_duration),
-            )
-        return self._cache
+        return Cache[RT, int](
+            self,
+            self.request_type,
+            int,
+            self.settings.redis_url,
+            datetime.timedelta(seconds=self.settings.cache_duration),
+            trusted=self.settings.trusted_cache,
+        )
 
     @abc.abstractmethod
     def _route(self, seldon_message: SeldonMessageRequest[RT]) -> int:
@@ -533,7 +596,7 @@ class BaseRouter(BaseBentoService, Generic[RT], metaclass=abc.ABCMeta):
             seldon_message_request = self._parse_input(
                 raw_request,
                 task,
-                SeldonMessageRequest[self.request_type],  # type: ignore[name-defined]
+                self._seldon_message_request_cls,
                 logging_context,
             )
 
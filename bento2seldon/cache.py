@@ -1,13 +1,15 @@
-from typing import Generic, List, Optional, Type, TypeVar, Union
+from typing import Generic, Iterator, List, Optional, Type, TypeVar, Union
 
 import datetime
 import logging
-from hashlib import sha256
 
+import orjson
 from bentoml import BentoService
 from pydantic import BaseModel
 from pydantic.generics import GenericModel
+from xxhash import xxh3_128_hexdigest
 
+from bento2seldon.model import OrjsonConfig
 from bento2seldon.seldon import DEPLOYMENT_ID, PRED_UNIT_ID, PRED_UNIT_KEY, Meta
 
 RT = TypeVar("RT", bound=BaseModel)
@@ -16,12 +18,31 @@ RE = TypeVar("RE", bound=Union[BaseModel, int])
 
 logger = logging.getLogger(__name__)
 
+try:
+    import msgspec.json
+
+    _json_loads = msgspec.json.decode
+except ImportError:
+    _json_loads = orjson.loads
+
+# Follows the puid -> key -> value indirection in a single round-trip.
+_GET_CACHE_VALUE_SCRIPT = """
+local key = redis.call('GET', KEYS[1])
+if not key then
+    return nil
+end
+return {key, redis.call('GET', key)}
+"""
+
 
 class CacheValue(GenericModel, Generic[RT, RE]):
     request: RT
     response: RE
     meta: Meta
 
+    class Config(OrjsonConfig):
+        pass
+
 
 class Cache(Generic[RT, RE]):
     def __init__(
@@ -31,11 +52,19 @@ class Cache(Generic[RT, RE]):
         response_type: Type[RE],
         redis_url: Optional[str],
         expiration_delta: datetime.timedelta,
+        trusted: bool = True,
     ) -> None:
         self._name: str = bento_service.name
         self._version: str = bento_service.version
         self._request_type = request_type
         self._response_type = response_type
+        self._cache_value_cls: Type[CacheValue[RT, RE]] = CacheValue[
+            request_type, response_type  # type: ignore[valid-type]
+        ]
+        self._request_key_prefix = (
+            f"{self._name}:{DEPLOYMENT_ID}:{self._version}:request:"
+        )
+        self._puid_key_prefix = f"{self._name}:{DEPLOYMENT_ID}:{self._version}:puid:"
         try:
             from redis import Redis
 
@@ -48,17 +77,43 @@ class Cache(Generic[RT, RE]):
             logger.warning("redis not installed.")
             self._redis = None
 
+        if self._redis:
+            self._get_cache_value_script = self._redis.register_script(
+                _GET_CACHE_VALUE_SCRIPT
+            )
+
         self._expiration_delta = expiration_delta
+        self._trusted = trusted
 
     def _request_to_key(self, request: RT) -> str:
-        request_hash = sha256(request.json().encode("utf-8")).hexdigest()
-        return self._request_hash_to_key(request_hash)
+        # request.json() so pydantic's encoders keep handling field types
+        # orjson cannot serialize on its own (Enum, Decimal, set, ...).
+        return self._request_hash_to_key(
+            xxh3_128_hexdigest(request.json().encode())
+        )
 
     def _request_hash_to_key(self, request_hash: str) -> str:
-        return f"{self._name}:{DEPLOYMENT_ID}:{self._version}:request:{request_hash}"
+        return self._request_key_prefix + request_hash
+
+    def _parse_cache_value(self, value: str) -> CacheValue[RT, RE]:
+        if not self._trusted:
+            return self._cache_value_cls.parse_raw(value)
+        # The value was serialized by this very service, so skip validation.
+        raw = _json_loads(value)
+        response = (
+            self._response_type.construct(**raw["response"])
+            if isinstance(self._response_type, type)
+            and issubclass(self._response_type, BaseModel)
+            else raw["response"]
+        )
+        return self._cache_value_cls.construct(
+            request=self._request_type.construct(**raw["request"]),
+            response=response,
+            meta=Meta.construct(**raw["meta"]),
+        )
 
     def _wrap_puid(self, puid: str) -> str:
-        return f"{self._name}:{DEPLOYMENT_ID}:{self._version}:puid:{puid}"
+        return self._puid_key_prefix + puid
 
     def should_cache(self, request: RT, response: RE, meta: Meta) -> bool:
         logger.debug("Verifying if should cache: %s, %s, %s", request, response, meta)
@@ -83,21 +138,17 @@ class Cache(Generic[RT, RE]):
     def get_response(self, puid: str, request: RT) -> Optional[RE]:
         if self._redis:
             key = self._request_to_key(request)
-            value = self._redis.get(key)
-            response: Optional[RE] = (
-                CacheValue[self._request_type, self._response_type]  # type: ignore[name-defined]
-                .parse_raw(value)
-                .response
-                if value
-                else None
-            )
-            if response is not None:
-                puid = self._wrap_puid(puid)
+            puid = self._wrap_puid(puid)
 
-                logger.debug("Caching %s=%s", puid, key)
+            logger.debug("Caching %s=%s", puid, key)
 
-                self._redis.set(puid, key, ex=self._expiration_delta)
-            return response
+            # The puid -> key mapping only depends on the request, so it can
+            # be refreshed in the same round-trip as the read.
+            with self._redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.set(puid, key, ex=self._expiration_delta)
+                value = pipe.execute()[0]
+            return self._parse_cache_value(value).response if value else None
         else:
             logger.warning("Redis not available.")
             return None
@@ -106,61 +157,56 @@ class Cache(Generic[RT, RE]):
         self, requests: List[RT], responses: List[RE], metas: List[Meta]
     ) -> None:
         if self._redis:
+            # Hoisting the bound methods out of the loop noticeably reduces
+            # the per-item interpreter overhead on large batches.
+            wrap_puid = self._wrap_puid
+            request_to_key = self._request_to_key
+            should_cache = self.should_cache
             puids, keys, values = zip(
                 *(
                     (
-                        self._wrap_puid(meta.puid),
-                        self._request_to_key(request),
+                        wrap_puid(meta.puid),
+                        request_to_key(request),
                         CacheValue(
                             request=request, response=response, meta=meta
                         ).json(),
                     )
                     for request, response, meta in zip(requests, responses, metas)
-                    if self.should_cache(request, response, meta)
+                    if should_cache(request, response, meta)
                 )
             )
 
             logger.debug("Caching multiple values: %s=%s=%s", puids, keys, values)
 
-            self._redis.mset({**dict(zip(puids, keys)), **dict(zip(keys, values))})
-
-            for k in keys + puids:
-                self._redis.expire(k, self._expiration_delta)
+            with self._redis.pipeline(transaction=False) as pipe:
+                for puid, key, value in zip(puids, keys, values):
+                    pipe.set(puid, key, ex=self._expiration_delta)
+                    pipe.set(key, value, ex=self._expiration_delta)
+                pipe.execute()
         else:
             logger.warning("Redis not available.")
 
     def get_responses(self, puids: List[str], requests: List[RT]) -> List[Optional[RE]]:
         if self._redis:
-            keys = [self._request_to_key(request) for request in requests]
-            responses = [
-                CacheValue[self._request_type, self._response_type]  # type: ignore[name-defined]
-                .parse_raw(value)
-                .response
-                if value
-                else None
-                for value in self._redis.mget(keys)
-            ]
-            puids = [self._wrap_puid(puid) for puid in puids]
+            request_to_key = self._request_to_key
+            parse_cache_value = self._parse_cache_value
+            wrap_puid = self._wrap_puid
+            keys = [request_to_key(request) for request in requests]
+            puids = [wrap_puid(puid) for puid in puids]
 
             logger.debug("Caching %s=%s", puids, keys)
 
-            puid_to_key_mapping = {
-                puid: key
-                for puid, key, response in zip(puids, keys, responses)
-                if response is not None
-            }
-
-            if puid_to_key_mapping:
-                self._redis.mset(
-                    {
-                        puid: key
-                        for puid, key, response in zip(puids, keys, responses)
-                        if response is not None
-                    }
-                )
-                for puid in puid_to_key_mapping.keys():
-                    self._redis.expire(puid, self._expiration_delta)
-            return responses
+            # The puid -> key mappings only depend on the requests, so they
+            # can be refreshed in the same round-trip as the batched read.
+            with self._redis.pipeline(transaction=False) as pipe:
+                pipe.mget(keys)
+                for puid, key in zip(puids, keys):
+                    pipe.set(puid, key, ex=self._expiration_delta)
+                values = pipe.execute()[0]
+            return [
+                parse_cache_value(value).response if value else None
+                for value in values
+            ]
         else:
             logger.warning("Redis not available.")
             return [None] * len(requests)
@@ -168,20 +214,14 @@ class Cache(Generic[RT, RE]):
     def get_cache_value(self, puid: str) -> Optional[CacheValue[RT, RE]]:
         if self._redis:
             puid = self._wrap_puid(puid)
-            key = self._redis.get(puid)
 
             logger.debug("Getting cache value for %s", puid)
-            if key:
-                logger.debug(
-                    "The key for %s exists and is %s. Getting the value...",
-                    key,
-                    puid,
-                )
-                value = self._redis.get(key)
+            result = self._get_cache_value_script(keys=[puid])
+            if result:
+                key, value = result
+                logger.debug("The key for %s exists and is %s.", puid, key)
                 if value:
-                    cache_value = CacheValue[
-                        self._request_type, self._response_type  # type: ignore[name-defined]
-                    ].parse_raw(value)
+                    cache_value = self._parse_cache_value(value)
                     logger.debug("Found cache value for %s: %s", puid, value)
                     return cache_value
                 return None
@@ -189,15 +229,24 @@ class Cache(Generic[RT, RE]):
             logger.warning("Redis not available.")
         return None
 
-    def get_all(self) -> List[CacheValue[RT, RE]]:
+    def get_all(self, batch_size: int = 500) -> Iterator[CacheValue[RT, RE]]:
         if self._redis:
-            return [
-                CacheValue.parse_raw(str(value))
-                for value in self._redis.mget(
-                    self._redis.keys(self._request_hash_to_key("*"))
-                )
-                if value is not None
-            ]
+            # SCAN instead of KEYS: the latter blocks the whole Redis server
+            # while it walks the keyspace.
+            batch: List[str] = []
+            for key in self._redis.scan_iter(
+                match=self._request_hash_to_key("*"), count=batch_size
+            ):
+                batch.append(key)
+                if len(batch) >= batch_size:
+                    yield from self._get_values(batch)
+                    batch = []
+            if batch:
+                yield from self._get_values(batch)
         else:
             logger.warning("Redis not available.")
-            return []
+
+    def _get_values(self, keys: List[str]) -> Iterator[CacheValue[RT, RE]]:
+        for value in self._redis.mget(keys):  # type: ignore[union-attr]
+            if value is not None:
+                yield self._parse_cache_value(value)
@@ -1,7 +1,6 @@
 from typing import Any, Dict
 
-import uuid
-from copy import deepcopy
+import secrets
 
 from bentoml import BentoService
 
@@ -14,7 +13,9 @@ class LoggingContext(Dict[str, Any]):
             "name": bento_service.name,
             "version": bento_service.version,
         }
-        self["http.request.uuid"] = str(uuid.uuid4())
+        # Cheaper than str(uuid.uuid4()) and just as unique for correlating
+        # log entries.
+        self["http.request.uuid"] = secrets.token_hex(16)
 
     def with_endpoint(self, endpoint: str) -> "LoggingContext":
         self["http.request.endpoint"] = endpoint
@@ -29,6 +30,10 @@ class LoggingContext(Dict[str, Any]):
         return self
 
     def with_status(self, status: int) -> "LoggingContext":
-        context = deepcopy(self)
+        # A shallow copy is enough here: the values are immutable primitives,
+        # except for the "service" dict, which is copied explicitly.
+        context = LoggingContext.__new__(LoggingContext)
+        dict.update(context, self)
+        context["service"] = self["service"].copy()
         context["http.response.status"] = status
         return context
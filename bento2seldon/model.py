@@ -1,8 +1,23 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
+import orjson
 from pydantic import BaseSettings, RedisDsn
 
 
+def orjson_dumps(v: Any, *, default: Optional[Callable[[Any], Any]]) -> str:
+    # orjson.dumps returns bytes, but pydantic expects a str.
+    return orjson.dumps(v, default=default).decode()
+
+
+class OrjsonConfig:
+    json_loads = orjson.loads
+    json_dumps = orjson_dumps
+
+
 class Settings(BaseSettings):
     redis_url: Optional[RedisDsn]
     cache_duration: int = 24 * 60 * 60
+    # Cached values are written by this service itself, so they can be
+    # rehydrated without re-running pydantic validation. Disable this when
+    # untrusted writers share the same Redis instance.
+    trusted_cache: bool = True
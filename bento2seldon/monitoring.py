@@ -1,6 +1,4 @@
-from typing import Any, Dict, List, Optional, Type, cast
-
-from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
 
 from bentoml import BentoService, config
 from prometheus_client import Counter, Histogram
@@ -13,12 +11,49 @@ from bento2seldon.utils import Timer
 PREDICT_ENDPOINT = "predict"
 FEEDBACK_ENDPOINT = "send-feedback"
 
+# Shared sentinel for calls without extra labels; it is only ever read, so
+# one dict can serve every call instead of allocating a fresh one each time.
+_EMPTY: Dict[str, Any] = {}
+
 
 class Monitor:
-    def __init__(self, bento_service: BentoService) -> None:
+    def __init__(
+        self, bento_service: BentoService, extra_labelnames: Sequence[str] = ()
+    ) -> None:
         self.service_name = bento_service.name
         self.version = bento_service.version
         self.namespace = config("instrument").get("default_namespace")
+        # Resolved .labels(...) children, so the hot path does not re-hash
+        # the same label values on every observation.
+        self._children: Dict[Tuple[Any, ...], MetricWrapperBase] = {}
+        # Resolved observe closures for time_model_execution, keyed like the
+        # children; only the Timer itself is allocated per call.
+        self._observers: Dict[Tuple[Any, ...], Callable[[float], None]] = {}
+        self._base_labelvalues = (DEPLOYMENT_ID, self.version)
+
+        # Creating the metrics eagerly fixes their schema at construction
+        # time instead of tying it to whatever extra the first call carries,
+        # and removes the hasattr checks from the hot path. The exception
+        # counter never receives extra labels.
+        extra_labelnames = list(extra_labelnames)
+        self._exception_counter = self._create_metric(
+            Counter, "exception_total", "Total number of exceptions"
+        )
+        self._model_execution_duration = self._create_metric(
+            Histogram,
+            "model_execution_duration_seconds",
+            "Model execution duration in seconds",
+            extra_labelnames,
+        )
+        self._model_execution_per_request_duration = self._create_metric(
+            Histogram,
+            "model_execution_per_request_duration_seconds",
+            "Model execution per request duration in seconds",
+            extra_labelnames,
+        )
+        self._reward = self._create_metric(
+            Histogram, "reward", "Reward provided by feedback", extra_labelnames
+        )
 
     def _create_metric(
         self,
@@ -40,25 +75,24 @@ class Monitor:
             labelnames=labelnames,
         )
 
-    def count_exceptions(
-        self, endpoint: str = PREDICT_ENDPOINT, extra: Optional[Dict[str, Any]] = None
-    ) -> ExceptionCounter:
-        if extra is None:
-            extra = {}
-
-        if not hasattr(self, "_exception_counter"):
-            self._exception_counter = self._create_metric(
-                Counter,
-                "exception_total",
-                "Total number of exceptions",
-                list(extra.keys()),
-            )
-
-        return cast(
-            Counter,
-            self._exception_counter.labels(
-                DEPLOYMENT_ID, self.version, endpoint, *extra.values()
-            ),
+    # Returns Any on purpose: the children expose count_exceptions/observe,
+    # which MetricWrapperBase does not declare, and typing.cast is a real
+    # function call at runtime.
+    def _child(
+        self, metric: MetricWrapperBase, endpoint: str, extra: Dict[str, Any]
+    ) -> Any:
+        key = (id(metric), endpoint, tuple(extra.values()))
+        child = self._children.get(key)
+        if child is None:
+            child = metric.labels(*self._base_labelvalues, endpoint, *extra.values())
+            self._children[key] = child
+        return child
+
+    # No extra parameter: the counter is created without extra labelnames,
+    # so extra label values would raise an incorrect-label-count error.
+    def count_exceptions(self, endpoint: str = PREDICT_ENDPOINT) -> ExceptionCounter:
+        return self._child(
+            self._exception_counter, endpoint, _EMPTY
         ).count_exceptions()
 
     def time_model_execution(
@@ -68,36 +102,28 @@ class Monitor:
         extra: Optional[Dict[str, Any]] = None,
     ) -> Timer:
         if extra is None:
-            extra = {}
-
-        if not hasattr(self, "_model_execution_duration"):
-            self._model_execution_duration = self._create_metric(
-                Histogram,
-                "model_execution_duration_seconds",
-                "Model execution duration in seconds",
-                list(extra.keys()),
+            extra = _EMPTY
+
+        # The closure only depends on these three values, so it is resolved
+        # once per distinct combination and reused; its body then only
+        # touches free variables, without self attribute loads or child
+        # lookups. The Timer stays per-call: it carries the start time.
+        key = (endpoint, parallel_executions, tuple(extra.values()))
+        observe = self._observers.get(key)
+        if observe is None:
+            duration_child = self._child(
+                self._model_execution_duration, endpoint, extra
             )
-        if not hasattr(self, "_model_execution_per_request_duration"):
-            self._model_execution_per_request_duration = self._create_metric(
-                Histogram,
-                "model_execution_per_request_duration_seconds",
-                "Model execution per request duration in seconds",
-                list(extra.keys()),
+            per_request_child = self._child(
+                self._model_execution_per_request_duration, endpoint, extra
             )
+            inv_parallel_executions = 1.0 / parallel_executions
 
-        def observe(duration: float) -> None:
-            cast(
-                Histogram,
-                self._model_execution_duration.labels(
-                    DEPLOYMENT_ID, self.version, endpoint, *list(extra.values())  # type: ignore[union-attr]
-                ),
-            ).observe(duration)
-            cast(
-                Histogram,
-                self._model_execution_per_request_duration.labels(
-                    DEPLOYMENT_ID, self.version, endpoint, *list(extra.values())  # type: ignore[union-attr]
-                ),
-            ).observe(duration / parallel_executions)
+            def observe(duration: float) -> None:
+                duration_child.observe(duration)
+                per_request_child.observe(duration * inv_parallel_executions)
+
+            self._observers[key] = observe
 
         return Timer(observe)
 
@@ -108,14 +134,6 @@ class Monitor:
         extra: Optional[Dict[str, Any]] = None,
     ) -> None:
         if extra is None:
-            extra = {}
-
-        if not hasattr(self, "_reward"):
-            self._reward = self._create_metric(
-                Histogram, "reward", "Reward provided by feedback", list(extra.keys())
-            )
+            extra = _EMPTY
 
-        cast(
-            Histogram,
-            self._reward.labels(DEPLOYMENT_ID, self.version, endpoint, *extra.values()),
-        ).observe(value)
+        self._child(self._reward, endpoint, extra).observe(value)
@@ -1,14 +1,20 @@
-from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar
 
 import enum
 import os
+import sys
 
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, Field, validator
 from pydantic.generics import GenericModel
 
+from bento2seldon.model import OrjsonConfig
+
 PRED_UNIT_KEY = "predictive_unit_id"
-PRED_UNIT_ID = os.environ.get("PREDICTIVE_UNIT_ID", "0")
-DEPLOYMENT_ID = os.environ.get("SELDON_DEPLOYMENT_ID", "0")
+# Interned so the strings hash once and compare by identity in the metric
+# label and tag dicts they end up in on every request.
+PRED_UNIT_ID = sys.intern(os.environ.get("PREDICTIVE_UNIT_ID", "0"))
+DEPLOYMENT_ID = sys.intern(os.environ.get("SELDON_DEPLOYMENT_ID", "0"))
 
 
 class StatusFlag(enum.Enum):
@@ -16,23 +22,57 @@ class StatusFlag(enum.Enum):
     FAILURE = "FAILURE"
 
 
+# Plain constants for the hot paths: enum value access goes through the
+# descriptor protocol on every lookup.
+SUCCESS = StatusFlag.SUCCESS.value
+FAILURE = StatusFlag.FAILURE.value
+
+
 class Status(BaseModel):
     code: int = 200
     info: Optional[str]
     reason: Optional[str]
-    status: str = StatusFlag.SUCCESS.value
+    status: str = SUCCESS
+
+    class Config(OrjsonConfig):
+        # Statuses are never mutated after construction, so validation can
+        # reuse instances instead of copying them.
+        allow_mutation = False
+        copy_on_model_validation = False
+
+
+# Statuses are immutable, so the plain OK one can be shared.
+_DEFAULT_STATUS = Status()
+
+
+# Shared containers for the construct() fast path in SeldonMessage.make()
+# only: its result is immediately serialized through .dict(), which copies
+# them, so they never escape to code that could mutate them. Meta instances
+# built through validation get their own dicts.
+_DEFAULT_TAGS: Dict[str, Any] = {PRED_UNIT_KEY: PRED_UNIT_ID}
+_EMPTY_DICT: Dict[str, Any] = {}
+
+
+def _default_tags() -> Dict[str, Any]:
+    return {PRED_UNIT_KEY: PRED_UNIT_ID}
 
 
 class Meta(BaseModel):
     puid: str = ""
-    tags: Dict[str, Any] = Field(default_factory=dict)
+    tags: Dict[str, Any] = Field(default_factory=_default_tags)
     routing: Dict[str, int] = Field(default_factory=dict)
     requestPath: Dict[str, str] = Field(default_factory=dict)
 
-    def __init__(self, **data: Any):
-        super().__init__(**data)
-        if PRED_UNIT_KEY not in self.tags:
-            self.tags[PRED_UNIT_KEY] = PRED_UNIT_ID
+    # Only runs when tags are supplied; the default factory already carries
+    # the predictive unit tag.
+    @validator("tags")
+    def _inject_pred_unit(cls, v: Dict[str, Any]) -> Dict[str, Any]:
+        v.setdefault(PRED_UNIT_KEY, PRED_UNIT_ID)
+        return v
+
+    class Config(OrjsonConfig):
+        # The puid is assigned after parsing, so mutation stays allowed.
+        copy_on_model_validation = False
 
 
 R = TypeVar("R", bound=BaseModel)
@@ -43,6 +83,31 @@ class SeldonMessage(GenericModel, Generic[R]):
     meta: Meta = Field(default_factory=Meta)
     jsonData: Optional[R]
 
+    @classmethod
+    def make(
+        cls,
+        jsonData: Optional[R] = None,
+        meta: Optional[Meta] = None,
+        status: Optional[Status] = None,
+    ) -> "SeldonMessage[R]":
+        # For outbound messages built from fields the service produced
+        # itself: construct() skips validation entirely.
+        if meta is None:
+            meta = Meta.construct(
+                puid="",
+                tags=_DEFAULT_TAGS,
+                routing=_EMPTY_DICT,
+                requestPath=_EMPTY_DICT,
+            )
+        return cls.construct(
+            status=status if status is not None else _DEFAULT_STATUS,
+            meta=meta,
+            jsonData=jsonData,
+        )
+
+    class Config(OrjsonConfig):
+        copy_on_model_validation = False
+
 
 class SeldonMessageRequest(SeldonMessage[R], Generic[R]):
     jsonData: R
@@ -57,18 +122,75 @@ class Feedback(GenericModel, Generic[R, S]):
     reward: Optional[float]
     truth: Optional[SeldonMessage[S]]
 
+    class Config(OrjsonConfig):
+        pass
+
+
+def specialize(
+    request_model: Type[R], response_model: Type[S]
+) -> Tuple[
+    Type[SeldonMessageRequest[R]], Type[SeldonMessage[S]], Type[Feedback[R, S]]
+]:
+    # Resolves the generic specializations once, at import/construction time,
+    # so request handlers do not hit GenericModel.__class_getitem__ (and the
+    # class-creation lock behind it) at runtime.
+    return (
+        SeldonMessageRequest[request_model],
+        SeldonMessage[response_model],
+        Feedback[request_model, response_model],
+    )
+
 
 class Tensor(BaseModel):
     shape: List[int]
-    values: List[Union[int, float]]
+    # A contiguous array instead of a list of boxed numbers: element-wise
+    # validation is skipped and numerical consumers can use it directly, e.g.
+    # tensor.values.reshape(tensor.shape).
+    values: np.ndarray
+
+    @validator("values", pre=True)
+    def _to_ndarray(cls, v: Any) -> np.ndarray:
+        return np.asarray(v)
+
+    def dict(self, **kwargs: Any) -> Dict[str, Any]:
+        # dict() does not apply json_encoders, so the array is unboxed here;
+        # pydantic recurses into nested models through dict(), so every
+        # container of a Tensor gets plain lists too.
+        result = super().dict(**kwargs)
+        values = result.get("values")
+        if isinstance(values, np.ndarray):
+            result["values"] = values.tolist()
+        return result
+
+    def __eq__(self, other: Any) -> bool:
+        # The default model comparison raises on ndarray fields ("truth
+        # value of an array is ambiguous").
+        if not isinstance(other, Tensor):
+            return NotImplemented  # type: ignore[return-value]
+        return self.shape == other.shape and bool(
+            np.array_equal(self.values, other.values)
+        )
+
+    class Config(OrjsonConfig):
+        allow_mutation = False
+        copy_on_model_validation = False
+        arbitrary_types_allowed = True
+        json_encoders = {np.ndarray: lambda a: a.tolist()}
 
 
 class DefaultData(BaseModel):
     names: Optional[List[str]]
     tensor: Optional[Tensor]
 
+    class Config(OrjsonConfig):
+        allow_mutation = False
+        copy_on_model_validation = False
+
 
 class RoutingSeldonMessage(BaseModel):
     status: Optional[Status]
     meta: Meta = Field(default_factory=Meta)
     data: DefaultData
+
+    class Config(OrjsonConfig):
+        pass
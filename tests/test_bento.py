@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from bento2seldon.bento import BasePredictor
+
+
+class _RecordingMonitor:
+    def __init__(self):
+        self.rewards = []
+
+    def observe_reward(self, value, endpoint="send-feedback", extra=None):
+        self.rewards.append(value)
+
+
+def test_send_feedback_observes_reward():
+    """A feedback carrying a reward must reach the monitor."""
+    service = SimpleNamespace(
+        monitor=_RecordingMonitor(),
+        extract_fields_from_request=lambda request: {},
+    )
+
+    BasePredictor._send_feedback(service, None, None, None, 0.5, None)
+
+    assert service.monitor.rewards == [0.5]
+
+
+def test_send_feedback_without_reward_does_not_observe():
+    service = SimpleNamespace(
+        monitor=_RecordingMonitor(),
+        extract_fields_from_request=lambda request: {},
+    )
+
+    BasePredictor._send_feedback(service, None, None, None, None, None)
+
+    assert service.monitor.rewards == []